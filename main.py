@@ -1,42 +1,97 @@
-import qrcode
 import re
 import os
+from functools import partial
 
 # EICAR Standard Antivirus Test String
 # This is a safe string used for testing antivirus software.
 # It is NOT a real virus, but it is detected as one by security products.
 EICAR_STRING = r"X5O!P%@AP[4\PZX54(P^)7CC)7}$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
 
+# Patterns common in malicious QR code payloads, compiled once at import.
+# They are kept as separate patterns rather than one alternation: each literal
+# pattern gets re's fast prefix search, which is ~2x faster on multi-KB payloads.
+MALICIOUS_PATTERNS = [
+    r"javascript:",
+    r"data:text/html",
+    r"<script",
+    r"cmd\.exe",
+    r"/etc/passwd"
+]
+_MALICIOUS_RES = [re.compile(p, re.IGNORECASE) for p in MALICIOUS_PATTERNS]
+
+def _trigger_char(pattern):
+    """
+    Returns a punctuation character that every match of pattern must contain,
+    or None if pattern is not a plain literal or has no such character.
+    """
+    literal = re.sub(r"\\(.)", r"\1", pattern)
+    if re.escape(literal) != pattern:
+        return None
+    for char in literal:
+        if char.isascii() and not char.isalnum():
+            return char
+    return None
+
+# Payloads containing none of these characters cannot match any pattern, so
+# the regex scan is skipped. The set is derived from MALICIOUS_PATTERNS; if any
+# pattern has no trigger character the prefilter is disabled (None) instead.
+_TRIGGER_CHARS = frozenset(_trigger_char(p) for p in MALICIOUS_PATTERNS)
+if None in _TRIGGER_CHARS:
+    _TRIGGER_CHARS = None
+
 def is_malicious_request(data):
     """
     Validation logic to reject truly malicious or exploitative content.
     In a real-world scenario, this helps prevent attacks like XSS or command injection.
     """
-    # Patterns common in malicious QR code payloads
-    malicious_patterns = [
-        r"javascript:",
-        r"data:text/html",
-        r"<script",
-        r"cmd\.exe",
-        r"/etc/passwd"
-    ]
-    
-    for pattern in malicious_patterns:
-        if re.search(pattern, data, re.IGNORECASE):
+    if _TRIGGER_CHARS is not None and not any(c in data for c in _TRIGGER_CHARS):
+        return False
+    for pattern in _MALICIOUS_RES:
+        if pattern.search(data):
             return True
     return False
 
-def generate_qr(data, filename="output_qr.png"):
+def _ensure_parent_dir(path):
+    """
+    Creates the parent directory of path if needed; bare filenames need no syscalls.
+    """
+    parent = os.path.dirname(path)
+    if parent and parent != ".":
+        os.makedirs(parent, exist_ok=True)
+
+def _render_image(qr):
+    """
+    Renders the QR matrix as a 1-bit image by upscaling one pixel per module,
+    instead of drawing a rectangle for every dark module.
+    """
+    from PIL import Image
+
+    matrix = qr.get_matrix()
+    size = len(matrix)
+    pixels = bytes(0 if cell else 255 for row in matrix for cell in row)
+    img = Image.frombytes("L", (size, size), pixels).convert("1")
+    return img.resize((size * qr.box_size, size * qr.box_size), Image.NEAREST)
+
+def generate_qr(data, filename="output_qr.png", png_compress_level=1, png_optimize=False,
+                verbose=True):
     """
     Generates a QR code image from the provided data if it passes security checks.
+    The image is always written as PNG with fast zlib settings by default; pass
+    png_compress_level=9 and png_optimize=True for the smallest files.
+    Progress messages are printed unless verbose is False.
     """
-    print(f"Generating QR Code for data: {data[:50]}...")
+    if verbose:
+        print(f"Generating QR Code for data: {data[:50]}...")
     
     if is_malicious_request(data):
-        print("ERROR: Malicious content detected. Request rejected for security reasons.")
+        if verbose:
+            print("ERROR: Malicious content detected. Request rejected for security reasons.")
         return False
 
     try:
+        # Imported lazily so rejected payloads never pay the qrcode/Pillow import cost
+        import qrcode
+
         qr = qrcode.QRCode(
             version=1,
             error_correction=qrcode.constants.ERROR_CORRECT_H,
@@ -46,18 +101,49 @@ def generate_qr(data, filename="output_qr.png"):
         qr.add_data(data)
         qr.make(fit=True)
 
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(filename), exist_ok=True) if os.path.dirname(filename) else None
-        
-        img.save(filename)
-        print(f"SUCCESS: QR Code saved to {filename}")
+        img = _render_image(qr)
+
+        _ensure_parent_dir(filename)
+
+        # Always PNG, whatever the extension, as qrcode's PilImage.save did
+        img.save(filename, format="PNG", compress_level=png_compress_level, optimize=png_optimize)
+        if verbose:
+            print(f"SUCCESS: QR Code saved to {filename}")
         return True
     except Exception as e:
-        print(f"FAILED: An error occurred: {e}")
+        if verbose:
+            print(f"FAILED: An error occurred: {e}")
         return False
 
+def generate_qr_batch(items, max_workers=None, png_compress_level=1, png_optimize=False,
+                      verbose=False):
+    """
+    Generates QR codes for an iterable of (data, filename) pairs across worker processes.
+    Mask selection in qrcode is CPU-bound pure Python, so processes scale where threads would not.
+    The PNG settings are forwarded to generate_qr for every item. Workers are quiet by
+    default; with verbose=True their messages are printed as they finish and may interleave.
+    Returns a list of booleans in the same order as items.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    # Imported lazily so importing main.py never loads multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(len(items), max_workers if max_workers is not None else (os.cpu_count() or 1))
+    datas, filenames = zip(*items)
+    # The executor validates workers before chunksize can divide by it
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(items) // (4 * workers))
+        worker = partial(
+            generate_qr,
+            png_compress_level=png_compress_level,
+            png_optimize=png_optimize,
+            verbose=verbose,
+        )
+        return list(executor.map(worker, datas, filenames, chunksize=chunksize))
+
 if __name__ == "__main__":
     # Example 1: Ethical malware test (EICAR)
     print("\n--- Scenario 1: Generating Ethical Test QR (EICAR) ---")